@@ -79,6 +79,11 @@ class View(object):
     """
 
     http_method_names = ['get', 'post', 'put', 'patch', 'delete', 'head', 'options', 'trace']
+
+    # Note that views deliberately do not define __slots__. Configuration
+    # is provided as class attributes which as_view() then overrides per
+    # instance, and the mixins also store per-request state (``object``,
+    # ``_context``, etc) on the instance. Neither is possible with slots.
     request = None
     args = None
     kwargs = None
@@ -133,8 +138,9 @@ class View(object):
         # Try to dispatch to the right method; if a method doesn't exist,
         # defer to the error handler. Also defer to the error handler if the
         # request method isn't on the approved list.
-        if request.method.lower() in self.http_method_names:
-            handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+        method = request.method.lower()
+        if method in self.http_method_names:
+            handler = getattr(self, method, self.http_method_not_allowed)
         else:
             handler = self.http_method_not_allowed
         response = handler(request, *args, **kwargs)
@@ -1,15 +1,68 @@
 import json
+
 from pyramid import httpexceptions
 from pyramid.response import Response
 from wtforms import FileField
 
 from wtforms_alchemy import ModelForm, model_form_factory
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from pyramid_views.utils import ImproperlyConfigured, get_model_from_obj
 from pyramid_views.views.base import TemplateResponseMixin, ContextMixin, View, MacroMixin
 from pyramid_views.views.detail import (SingleObjectMixin,
                                         SingleObjectTemplateResponseMixin, BaseDetailView)
 
+# Generated model form classes, keyed by (model, fields). Building these
+# involves SQLAlchemy introspection and WTForms class creation, so we only
+# want to do it once per configuration rather than once per request.
+_model_form_cache = {}
+
+# Request methods for which the form should be bound to the submitted data
+_WRITE_METHODS = frozenset(('POST', 'PUT'))
+
+# Body of the empty 200 responses returned by endpoints without a success URL
+_EMPTY_BODY = b''
+
+
+def _get_model_form(model, fields):
+    """ Return a model form class for ``model``, limited to ``fields``
+
+    Form classes are generated once and then cached.
+    """
+    if fields is not None:
+        fields = tuple(fields)
+    key = (model, fields)
+    try:
+        return _model_form_cache[key]
+    except KeyError:
+        pass
+
+    # Create a new class to use as the base. We do this to ensure
+    # Meta.model is available when the form is generated by the factory.
+    model_, fields_ = model, fields
+    class ModelFormWithModel(ModelForm):
+        class Meta:
+            model = model_
+            only = fields_
+    model_form = model_form_factory(ModelFormWithModel)
+    model_form.Meta.model = model
+    _model_form_cache[key] = model_form
+    return model_form
+
+
+def _dump_json(value):
+    """ Encode ``value`` as JSON bytes, using orjson if it is installed
+    """
+    if orjson is not None:
+        # Form errors may use None as a key for form-level errors
+        # (as of WTForms 3), which the stdlib encodes as "null"
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value).encode('utf8')
+
 
 class FormMixin(ContextMixin):
     """
@@ -32,7 +85,10 @@ class FormMixin(ContextMixin):
         """
         Returns the initial data to use for forms on this view.
         """
-        return self.initial.copy()
+        # Avoid copying in the common case of no initial data. Note that
+        # WTForms treats empty data the same as no data at all.
+        initial = self.initial
+        return initial.copy() if initial else {}
 
     def get_prefix(self):
         """
@@ -62,7 +118,7 @@ class FormMixin(ContextMixin):
             'obj': getattr(self, 'object', None),
         }
 
-        if self.request.method.upper() in ('POST', 'PUT'):
+        if self.request.method.upper() in _WRITE_METHODS:
             # Note that, unlike Django, Pyramid does not
             # distinguish file data from post data (Django
             # has both POST and FILES, Pyramid has just POST)
@@ -93,7 +149,7 @@ class FormMixin(ContextMixin):
             if self.endpoint:
                 # This is an endpoint, so we can just return an
                 # empty response with status 200
-                return Response('')
+                return Response(body=_EMPTY_BODY)
             else:
                 raise
 
@@ -105,10 +161,14 @@ class FormMixin(ContextMixin):
         if not self.endpoint:
             return self.render_to_response(self.get_context_data(form=form))
         else:
-            # This is an endpoint, so return the errors as JSON
-            response = httpexceptions.HTTPBadRequest()
-            response.body = json.dumps({'errors': form.errors})
-            return response
+            # This is an endpoint, so return the errors as JSON. Note that
+            # WTForms memoises form.errors, so later access (eg. by
+            # templates or logging) doesn't collect the errors again.
+            return Response(
+                body=_dump_json({'errors': form.errors}),
+                status=400,
+                content_type='application/json',
+            )
 
 
 class ModelFormMixin(FormMixin, SingleObjectMixin):
@@ -116,6 +176,7 @@ class ModelFormMixin(FormMixin, SingleObjectMixin):
     A mixin that provides a way to show and handle a modelform in a request.
     """
     fields = None
+    flush_on_save = True
 
     def get_form_class(self):
         """
@@ -136,16 +197,7 @@ class ModelFormMixin(FormMixin, SingleObjectMixin):
                 # from that
                 model = get_model_from_obj(self.get_query())
 
-            # Create a new class to use as the base. We do this to ensure
-            # Meta.model is available when the form is generated by the factory.
-            model_ = model
-            class ModelFormWithModel(ModelForm):
-                class Meta:
-                    model = model_
-                    only = self.fields
-            model_form = model_form_factory(ModelFormWithModel)
-            model_form.Meta.model = model
-            return model_form
+            return _get_model_form(model, self.fields)
 
     def get_form_kwargs(self):
         """
@@ -176,7 +228,9 @@ class ModelFormMixin(FormMixin, SingleObjectMixin):
         If the form is valid, save the associated model.
         """
         if self.object is None:
-            model = self.model or self.get_form_class().Meta.model
+            # The form is an instance of the resolved form class, so
+            # there is no need to resolve the form class again here
+            model = self.model or type(form).Meta.model
             self.object = model()
         self.populate_obj(form)
         self.save()
@@ -191,10 +245,13 @@ class ModelFormMixin(FormMixin, SingleObjectMixin):
         """
         Persist the model to the DB. Override this method
         if you need to alter the model pre or post save.
+
+        The session is flushed unless ``flush_on_save`` is ``False``.
         """
         self.db_session.add(self.object)
-        # Do a flush to ensure we get the primary key back
-        self.db_session.flush()
+        if self.flush_on_save:
+            # Do a flush to ensure we get the primary key back
+            self.db_session.flush()
         return self.object
 
 
@@ -270,6 +327,7 @@ class BaseUpdateView(ModelFormMixin, ProcessFormView):
     Using this base class requires subclassing to provide a response mixin.
     """
     partial_updates = False
+    always_update = ()
 
     def get(self, request, *args, **kwargs):
         self.object = self.get_object()
@@ -283,20 +341,24 @@ class BaseUpdateView(ModelFormMixin, ProcessFormView):
         """ Populate ``self.object`` with the values from ``form``
 
         Supports doing partial updates if enabled via the
-        ``partial_updates`` flag
+        ``partial_updates`` flag. Fields named in ``always_update``
+        are populated during partial updates even if not posted.
         """
         if not self.partial_updates:
             form.populate_obj(self.object)
         else:
+            # Webob's MultiDict does a linear scan for membership
+            # tests, so collect the posted names up front
+            post_keys = frozenset(self.request.POST.keys())
             for name, field in form._fields.items():
                 # Only populate fields present in the post request
                 # as this is a partial update.
                 # Note we also exclude empty file upload fields, as it is
                 # commonly desirable to leave a file field unchanged, rather than
                 # blanking it out (and pre-populating a file field is not an option).
-                in_post_data = name in self.request.POST
+                in_post_data = name in post_keys
                 empty_file_upload = isinstance(field, FileField) and field.data == ''
-                always_update = name in getattr(self, 'always_update', [])
+                always_update = name in self.always_update
                 if always_update or (in_post_data and not empty_file_upload):
                     field.populate_obj(self.object, name)
 
@@ -333,7 +395,7 @@ class DeletionMixin(object):
             if getattr(self, 'endpoint', None):
                 # This is an endpoint, so we can just return an
                 # empty response with status 200
-                return Response('')
+                return Response(body=_EMPTY_BODY)
             else:
                 raise
 
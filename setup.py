@@ -29,4 +29,8 @@ setup(
         'wtforms',
         'wtforms-alchemy',
     ],
+    extras_require={
+        # Faster JSON encoding of endpoint error responses
+        'orjson': ['orjson; python_version >= "3"'],
+    },
 )
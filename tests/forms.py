@@ -12,6 +12,12 @@ class AuthorForm(ModelForm):
         include = ['name', 'slug']
 
 
+class UppercaseSlugAuthorForm(AuthorForm):
+    # The slug filter applies even when the slug isn't posted, so the
+    # form's slug differs from the object's unless it is already upper case
+    slug = TextField(filters=[lambda value: value.upper() if value else value])
+
+
 class ContactForm(Form):
     name = TextField(validators=[DataRequired(), Length(max=100)])
     message = TextAreaField()
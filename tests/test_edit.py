@@ -14,7 +14,14 @@ from pyramid_views.views.edit import FormMixin, ModelFormMixin, CreateView
 from tests import views
 from tests.models import Artist, Author
 from tests.base import BaseTest, Session
-from tests.forms import AuthorForm
+from tests.forms import AuthorForm, UppercaseSlugAuthorForm
+
+
+def author_form_errors(data):
+    """ Return the errors the author form gives for ``data`` """
+    form = views.AuthorCreate().get_form_class()(formdata=MultiDict(data))
+    form.validate()
+    return form.errors
 
 
 class FormMixinTests(BaseTest):
@@ -96,6 +103,9 @@ class CreateViewTests(BaseTest):
         self.assertEqual(res.status_code, 200)
         self.assertTemplateUsed(res, 'tests:templates/author_form.html')
         self.assertEqual(len(res.context['form'].errors), 1)
+        # Errors are collected once and then shared by every access
+        form = res.context['form']
+        self.assertIs(form.errors, form.errors)
         self.assertEqual(Session.query(Author).count(), 0)
 
     def test_create_with_object_url(self):
@@ -109,6 +119,26 @@ class CreateViewTests(BaseTest):
         self.assertRedirects(res, '/detail/artist/%d/' % artist.id)
         self.assertQuerysetEqual(Session.query(Artist).all(), ['<Artist: Rene Magritte>'])
 
+    def test_create_flushes_on_save(self):
+        view = views.AuthorCreate.as_view()
+        res = view(DummyRequest(
+            method='POST',
+            params=MultiDict({'name': 'Randall Munroe', 'slug': 'randall-munroe'})
+        ))
+        self.assertRedirects(res, '/list/authors/')
+        self.assertEqual(list(Session.new), [])
+
+    def test_create_without_flush_on_save(self):
+        view = views.AuthorCreate.as_view(flush_on_save=False)
+        res = view(DummyRequest(
+            method='POST',
+            params=MultiDict({'name': 'Randall Munroe', 'slug': 'randall-munroe'})
+        ))
+        self.assertRedirects(res, '/list/authors/')
+        # The new author is left pending until the next flush
+        self.assertQuerysetEqual(list(Session.new), ['<Author: Randall Munroe>'])
+        self.assertQuerysetEqual(Session.query(Author).all(), ['<Author: Randall Munroe>'])
+
     def test_create_with_redirect(self):
         view = views.NaiveAuthorCreate.as_view(success_url='/edit/authors/create/')
         res = view(DummyRequest(
@@ -177,6 +207,23 @@ class CreateViewTests(BaseTest):
         fields = [field.name for field in form_class()]
         self.assertEqual(fields, ['name'])
 
+    def test_create_view_form_class_cached(self):
+        class MyCreateView(CreateView):
+            model = Author
+            fields = ['name']
+        form_class = MyCreateView().get_form_class()
+        self.assertIs(MyCreateView().get_form_class(), form_class)
+
+        # Equivalent field lists share the same generated form
+        class OtherCreateView(CreateView):
+            model = Author
+            fields = ('name',)
+        self.assertIs(OtherCreateView().get_form_class(), form_class)
+
+        class AllFieldsCreateView(CreateView):
+            model = Author
+        self.assertIsNot(AllFieldsCreateView().get_form_class(), form_class)
+
     def test_create_view_all_fields(self):
         class MyCreateView(CreateView):
             model = Author
@@ -235,9 +282,11 @@ class CreateViewTests(BaseTest):
             params=MultiDict({'name': 'A' * 101, 'slug': 'randall-munroe'})
         ))
         self.assertEqual(res.status_code, 400)
+        self.assertEqual(res.content_type, 'application/json')
         self.assertEqual(Session.query(Author).count(), 0)
         decoded = json.loads(res.body)
-        self.assertIn('errors', decoded)
+        expected_errors = author_form_errors({'name': 'A' * 101, 'slug': 'randall-munroe'})
+        self.assertEqual(decoded, {'errors': expected_errors})
 
 
 class UpdateViewTests(BaseTest):
@@ -443,8 +492,10 @@ class UpdateViewTests(BaseTest):
             params=MultiDict({'name': 'a' * 101, 'slug': 'randall-munroe'}),
         ), pk=a.id)
         self.assertEqual(res.status_code, 400)
+        self.assertEqual(res.content_type, 'application/json')
         decoded = json.loads(res.body)
-        self.assertIn('errors', decoded)
+        expected_errors = author_form_errors({'name': 'a' * 101, 'slug': 'randall-munroe'})
+        self.assertEqual(decoded, {'errors': expected_errors})
         self.assertQuerysetEqual(Session.query(Author).all(), ['<Author: Randall Munroe>'])
 
     def test_update_invalid_endpoint_with_url(self):
@@ -458,8 +509,10 @@ class UpdateViewTests(BaseTest):
             params=MultiDict({'name': 'a' * 101, 'slug': 'randall-munroe'}),
         ), pk=a.id)
         self.assertEqual(res.status_code, 400)
+        self.assertEqual(res.content_type, 'application/json')
         decoded = json.loads(res.body)
-        self.assertIn('errors', decoded)
+        expected_errors = author_form_errors({'name': 'a' * 101, 'slug': 'randall-munroe'})
+        self.assertEqual(decoded, {'errors': expected_errors})
         self.assertQuerysetEqual(Session.query(Author).all(), ['<Author: Randall Munroe>'])
 
     def test_partial_update(self):
@@ -489,6 +542,29 @@ class UpdateViewTests(BaseTest):
         self.assertQuerysetEqual(author.name, 'Randall Munroe (xkcd)')
         self.assertQuerysetEqual(author.slug, 'randall-munroe')
 
+    def test_partial_update_always_update(self):
+        a = self.author(
+            name='Randall Munroe',
+            slug='randall-munroe',
+        )
+        params = MultiDict({'name': 'Randall Munroe (xkcd)'})
+
+        # The slug isn't posted, so isn't updated
+        view = views.AuthorUpdate.as_view(partial_updates=True, form_class=UppercaseSlugAuthorForm)
+        res = view(DummyRequest(method='POST', params=params), pk=a.id)
+        self.assertRedirects(res, '/list/authors/')
+        author = Session.query(Author).one()
+        self.assertEqual(author.name, 'Randall Munroe (xkcd)')
+        self.assertEqual(author.slug, 'randall-munroe')
+
+        # Unless it is listed in always_update
+        view = views.AuthorUpdate.as_view(partial_updates=True, form_class=UppercaseSlugAuthorForm,
+                                          always_update=['slug'])
+        res = view(DummyRequest(method='POST', params=params), pk=a.id)
+        self.assertRedirects(res, '/list/authors/')
+        author = Session.query(Author).one()
+        self.assertEqual(author.slug, 'RANDALL-MUNROE')
+
 
 class DeleteViewTests(BaseTest):
 